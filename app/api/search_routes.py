@@ -3,96 +3,161 @@ Search API Routes
 """
 
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+import orjson
+from flask import Blueprint, request, current_app, stream_with_context
+from app.core.config import Config
 from app.utils.rate_limiter import rate_limit
+from app.utils.responses import cacheable_json_response, compute_etag, dumps, json_response
 from app.utils.validators import validate_search_params
 
 logger = logging.getLogger(__name__)
 
 search_bp = Blueprint('search', __name__)
 
+SAMPLE_QUERIES = (
+    "artificial intelligence machine learning",
+    "climate change environmental impact",
+    "space exploration mars mission",
+    "quantum computing algorithms",
+    "biotechnology genetic engineering",
+    "renewable energy solar power",
+    "cybersecurity data protection",
+    "blockchain cryptocurrency technology",
+    "medical research drug discovery",
+    "robotics automation industry",
+    "neural networks deep learning",
+    "sustainable development goals",
+    "satellite communication systems",
+    "quantum entanglement physics",
+    "CRISPR gene editing technology",
+    "wind energy turbine design",
+    "network security protocols",
+    "digital currency economics",
+    "cancer treatment research",
+    "autonomous vehicle technology"
+)
+SAMPLE_QUERIES_JSON = dumps({'queries': SAMPLE_QUERIES})
+SAMPLE_QUERIES_ETAG = compute_etag(SAMPLE_QUERIES_JSON)
+
+# Search type -> SearchService method for single-approach searches
+SEARCH_DISPATCH = {
+    'semantic': 'search_semantic',
+    'keyword': 'search_keyword',
+    'hybrid': 'search_hybrid'
+}
+MAX_RESULTS_CAP = min(Config.MAX_RESULTS, 50)
+MAX_DOCUMENT_IDS = 100  # per /documents request
+
+# Suggestion corpus, in the order suggestions are returned
+SEARCH_SUGGESTIONS = (
+    "artificial intelligence", "machine learning", "deep learning",
+    "climate change", "environmental science", "global warming",
+    "space exploration", "mars mission", "astronomy",
+    "quantum computing", "quantum physics", "quantum algorithms",
+    "biotechnology", "genetic engineering", "CRISPR",
+    "renewable energy", "solar power", "wind energy",
+    "cybersecurity", "data protection", "network security",
+    "blockchain", "cryptocurrency", "digital currency",
+    "medical research", "drug discovery", "cancer treatment",
+    "robotics", "automation", "autonomous vehicles"
+)
+MAX_SUGGESTIONS = 10
+
+# Sorted copy for bisecting prefix lookups, with each entry's position in SEARCH_SUGGESTIONS
+SUGGESTION_INDEX = tuple(sorted((q, i) for i, q in enumerate(SEARCH_SUGGESTIONS)))
+SUGGESTION_KEYS = tuple(q for q, _ in SUGGESTION_INDEX)
+
+# Newline-joined corpus for substring matching, with each entry's start offset
+SUGGESTION_TEXT = '\n'.join(SEARCH_SUGGESTIONS)
+SUGGESTION_OFFSETS = tuple(accumulate((len(q) + 1 for q in SEARCH_SUGGESTIONS[:-1]), initial=0))
+
+def _prefix_suggestions(prefix: str, limit: int = MAX_SUGGESTIONS) -> list:
+    """Return up to `limit` suggestions starting with `prefix`, in corpus order"""
+    positions = []
+    for i in range(bisect_left(SUGGESTION_KEYS, prefix), len(SUGGESTION_KEYS)):
+        if not SUGGESTION_KEYS[i].startswith(prefix):
+            break
+        positions.append(SUGGESTION_INDEX[i][1])
+    return [SEARCH_SUGGESTIONS[i] for i in sorted(positions)[:limit]]
+
+def _stream_all_approaches(search_service, query: str, max_results: int):
+    """Yield the all-approaches response body one approach at a time"""
+    yield b'{"query":' + dumps(query) + b',"approaches":{'
+    for i, (search_type, approach) in enumerate(search_service.iter_approaches(query, max_results)):
+        yield (b',' if i else b'') + dumps(search_type) + b':' + dumps(approach)
+    yield b'}}'
+
+def _substring_suggestions(fragment: str, limit: int, exclude=()) -> list:
+    """Return up to `limit` suggestions containing `fragment`, skipping `exclude`"""
+    if not fragment or '\n' in fragment:
+        return []
+    suggestions = []
+    pos = SUGGESTION_TEXT.find(fragment)
+    while pos != -1 and len(suggestions) < limit:
+        # Map the match back to its entry, then resume after that entry
+        i = bisect_right(SUGGESTION_OFFSETS, pos) - 1
+        candidate = SEARCH_SUGGESTIONS[i]
+        if candidate not in exclude:
+            suggestions.append(candidate)
+        pos = SUGGESTION_TEXT.find(fragment, SUGGESTION_OFFSETS[i] + len(candidate) + 1)
+    return suggestions
+
 @search_bp.route('/search', methods=['POST'])
 @rate_limit(requests_per_minute=60)
 def search():
     """Main search endpoint"""
     try:
         # Validate request
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'JSON data required'}), 400
+        try:
+            data = orjson.loads(request.get_data())
+        except orjson.JSONDecodeError:
+            return json_response({'error': 'Invalid JSON'}, 400)
+        if not data or not isinstance(data, dict):
+            return json_response({'error': 'JSON data required'}, 400)
         
         # Validate parameters
         validation_error = validate_search_params(data)
         if validation_error:
-            return jsonify({'error': validation_error}), 400
+            return json_response({'error': validation_error}, 400)
         
-        # Extract parameters
-        query = data.get('query', '').strip()
-        max_results = min(data.get('max_results', 10), 50)  # Limit to 50 results
+        # Extract parameters (presence and types already validated)
+        query = data['query'].strip()
+        max_results = data.get('max_results', 10)
+        if max_results > MAX_RESULTS_CAP:
+            max_results = MAX_RESULTS_CAP
         search_type = data.get('search_type', 'all')  # all, semantic, keyword, hybrid
         
         # Get search service
         search_service = current_app.search_service
         
         # Perform search based on type
-        if search_type == 'semantic':
-            results = {
-                'query': query,
-                'approaches': {
-                    'semantic': search_service.search_semantic(query, max_results)
-                }
-            }
-        elif search_type == 'keyword':
-            results = {
-                'query': query,
-                'approaches': {
-                    'keyword': search_service.search_keyword(query, max_results)
-                }
-            }
-        elif search_type == 'hybrid':
-            results = {
-                'query': query,
-                'approaches': {
-                    'hybrid': search_service.search_hybrid(query, max_results)
-                }
+        method_name = SEARCH_DISPATCH.get(search_type)
+        if not method_name:
+            # Default: all approaches, streamed as each one completes
+            return current_app.response_class(
+                stream_with_context(_stream_all_approaches(search_service, query, max_results)),
+                mimetype='application/json'
+            )
+        
+        results = {
+            'query': query,
+            'approaches': {
+                search_type: getattr(search_service, method_name)(query, max_results)
             }
-        else:
-            # Default: all approaches
-            results = search_service.search_all_approaches(query, max_results)
+        }
         
-        return jsonify(results)
+        return json_response(results)
         
     except Exception as e:
-        logger.error(f"Search failed: {e}")
-        return jsonify({'error': 'Search failed'}), 500
+        logger.error("Search failed: %s", e)
+        return json_response({'error': 'Search failed'}, 500)
 
 @search_bp.route('/sample-queries', methods=['GET'])
 def sample_queries():
     """Get sample queries for testing"""
-    queries = [
-        "artificial intelligence machine learning",
-        "climate change environmental impact",
-        "space exploration mars mission",
-        "quantum computing algorithms",
-        "biotechnology genetic engineering",
-        "renewable energy solar power",
-        "cybersecurity data protection",
-        "blockchain cryptocurrency technology",
-        "medical research drug discovery",
-        "robotics automation industry",
-        "neural networks deep learning",
-        "sustainable development goals",
-        "satellite communication systems",
-        "quantum entanglement physics",
-        "CRISPR gene editing technology",
-        "wind energy turbine design",
-        "network security protocols",
-        "digital currency economics",
-        "cancer treatment research",
-        "autonomous vehicle technology"
-    ]
-    
-    return jsonify({'queries': queries})
+    return cacheable_json_response(SAMPLE_QUERIES_JSON, SAMPLE_QUERIES_ETAG)
 
 @search_bp.route('/search-suggestions', methods=['GET'])
 def search_suggestions():
@@ -100,30 +165,17 @@ def search_suggestions():
     try:
         prefix = request.args.get('q', '').strip().lower()
         if not prefix or len(prefix) < 2:
-            return jsonify({'suggestions': []})
-        
-        # Simple prefix matching on sample queries
-        sample_queries = [
-            "artificial intelligence", "machine learning", "deep learning",
-            "climate change", "environmental science", "global warming",
-            "space exploration", "mars mission", "astronomy",
-            "quantum computing", "quantum physics", "quantum algorithms",
-            "biotechnology", "genetic engineering", "CRISPR",
-            "renewable energy", "solar power", "wind energy",
-            "cybersecurity", "data protection", "network security",
-            "blockchain", "cryptocurrency", "digital currency",
-            "medical research", "drug discovery", "cancer treatment",
-            "robotics", "automation", "autonomous vehicles"
-        ]
-        
-        suggestions = [q for q in sample_queries if q.startswith(prefix)]
-        suggestions = suggestions[:10]  # Limit to 10 suggestions
-        
-        return jsonify({'suggestions': suggestions})
+            return json_response({'suggestions': []})
+        
+        suggestions = _prefix_suggestions(prefix)
+        if Config.SUGGESTION_SUBSTRING_MATCH and len(suggestions) < MAX_SUGGESTIONS:
+            suggestions += _substring_suggestions(prefix, MAX_SUGGESTIONS - len(suggestions), suggestions)
+        
+        return json_response({'suggestions': suggestions})
         
     except Exception as e:
-        logger.error(f"Search suggestions failed: {e}")
-        return jsonify({'suggestions': []})
+        logger.error("Search suggestions failed: %s", e)
+        return json_response({'suggestions': []})
 
 @search_bp.route('/document/<doc_id>', methods=['GET'])
 def get_document(doc_id):
@@ -131,13 +183,32 @@ def get_document(doc_id):
     try:
         search_service = current_app.search_service
         
-        # Find document in sample data
-        for doc in search_service.sample_data:
-            if doc['id'] == doc_id:
-                return jsonify(doc)
+        doc = search_service.get_document(doc_id)
+        if doc is None:
+            return json_response({'error': 'Document not found'}, 404)
+        
+        return cacheable_json_response(dumps(doc))
+        
+    except Exception as e:
+        logger.error("Failed to get document %s: %s", doc_id, e)
+        return json_response({'error': 'Failed to retrieve document'}, 500)
+
+@search_bp.route('/documents', methods=['GET'])
+def get_documents():
+    """Get several documents by ID, e.g. /documents?ids=a,b,c"""
+    try:
+        # Deduplicate while keeping request order
+        ids = list(dict.fromkeys(i for i in request.args.get('ids', '').split(',') if i))
+        if not ids:
+            return json_response({'error': 'ids parameter is required'}, 400)
+        if len(ids) > MAX_DOCUMENT_IDS:
+            return json_response({'error': f'At most {MAX_DOCUMENT_IDS} ids allowed per request'}, 400)
+        
+        search_service = current_app.search_service
+        documents = {doc_id: search_service.get_document(doc_id) for doc_id in ids}
         
-        return jsonify({'error': 'Document not found'}), 404
+        return json_response({'documents': documents})
         
     except Exception as e:
-        logger.error(f"Failed to get document {doc_id}: {e}")
-        return jsonify({'error': 'Failed to retrieve document'}), 500
\ No newline at end of file
+        logger.error("Failed to get documents: %s", e)
+        return json_response({'error': 'Failed to retrieve documents'}, 500)
@@ -3,40 +3,56 @@ System API Routes
 """
 
 import logging
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, current_app
+from app.core.search_service import QDRANT_ERRORS
 from app.utils.rate_limiter import rate_limit
+from app.utils.responses import cacheable_json_response, compute_etag, dumps, json_response
+from app.utils.response_cache import cached_response
 
 logger = logging.getLogger(__name__)
 
 system_bp = Blueprint('system', __name__)
 
+SYSTEM_INFO = {
+    'name': 'Semantic Search Application',
+    'version': '1.0.0',
+    'description': 'Production-ready semantic search with multiple approaches',
+    'features': (
+        'Semantic Search (Dense Vector)',
+        'Keyword Search (BM25-style)',
+        'Hybrid Search (Combined)',
+        'Real-time Performance Metrics',
+        'Multiple Search Approaches'
+    ),
+    'technologies': (
+        'Python Flask',
+        'Qdrant Vector Database',
+        'Sentence Transformers',
+        'TailwindCSS',
+        'Alpine.js'
+    ),
+    'endpoints': {
+        'search': '/api/search',
+        'health': '/api/health',
+        'status': '/api/status',
+        'sample_queries': '/api/sample-queries'
+    }
+}
+SYSTEM_INFO_JSON = dumps(SYSTEM_INFO)
+SYSTEM_INFO_ETAG = compute_etag(SYSTEM_INFO_JSON)
+
 @system_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    try:
-        search_service = current_app.search_service
-        status = search_service.get_system_status()
-        
-        # Determine overall health
-        overall_healthy = (
-            status.get('model_loaded', False) and
-            status.get('document_count', 0) > 0
-        )
-        
-        response = {
-            'status': 'healthy' if overall_healthy else 'unhealthy',
-            'timestamp': None,
-            'components': status
-        }
-        
-        return jsonify(response), 200 if overall_healthy else 503
-        
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return jsonify({
+    snapshot = current_app.health_monitor.get_snapshot()
+    if snapshot is None:
+        return json_response({
             'status': 'unhealthy',
-            'error': str(e)
-        }), 503
+            'error': 'Health status is stale'
+        }, 503)
+    
+    body, status_code, _ = snapshot
+    return current_app.response_class(body, status=status_code, mimetype='application/json')
 
 @system_bp.route('/status', methods=['GET'])
 @rate_limit(requests_per_minute=30)
@@ -46,50 +62,20 @@ def system_status():
         search_service = current_app.search_service
         status = search_service.get_system_status()
         
-        return jsonify(status)
+        return json_response(status)
         
     except Exception as e:
-        logger.error(f"System status failed: {e}")
-        return jsonify({'error': 'Failed to get system status'}), 500
+        logger.error("System status failed: %s", e)
+        return json_response({'error': 'Failed to get system status'}, 500)
 
 @system_bp.route('/info', methods=['GET'])
 def system_info():
     """System information endpoint"""
-    try:
-        info = {
-            'name': 'Semantic Search Application',
-            'version': '1.0.0',
-            'description': 'Production-ready semantic search with multiple approaches',
-            'features': [
-                'Semantic Search (Dense Vector)',
-                'Keyword Search (BM25-style)',
-                'Hybrid Search (Combined)',
-                'Real-time Performance Metrics',
-                'Multiple Search Approaches'
-            ],
-            'technologies': [
-                'Python Flask',
-                'Qdrant Vector Database',
-                'Sentence Transformers',
-                'TailwindCSS',
-                'Alpine.js'
-            ],
-            'endpoints': {
-                'search': '/api/search',
-                'health': '/api/health',
-                'status': '/api/status',
-                'sample_queries': '/api/sample-queries'
-            }
-        }
-        
-        return jsonify(info)
-        
-    except Exception as e:
-        logger.error(f"System info failed: {e}")
-        return jsonify({'error': 'Failed to get system info'}), 500
+    return cacheable_json_response(SYSTEM_INFO_JSON, SYSTEM_INFO_ETAG)
 
 @system_bp.route('/metrics', methods=['GET'])
 @rate_limit(requests_per_minute=10)
+@cached_response(ttl=5)
 def system_metrics():
     """System performance metrics endpoint"""
     try:
@@ -106,17 +92,18 @@ def system_metrics():
         # Add collection metrics if available
         if search_service.client:
             try:
-                collection_info = search_service.client.get_collection(search_service.config.COLLECTION_NAME)
+                collection_info = search_service.get_collection_info()
                 metrics['collection_metrics'] = {
                     'vectors_count': collection_info.vectors_count,
                     'indexed_vectors_count': collection_info.indexed_vectors_count,
                     'status': collection_info.status
                 }
-            except:
-                metrics['collection_metrics'] = {'error': 'Collection not found'}
+            except QDRANT_ERRORS as e:
+                logger.warning("Collection info fetch failed: %s", e)
+                metrics['collection_metrics'] = {'error': str(e)}
         
-        return jsonify(metrics)
+        return json_response(metrics)
         
     except Exception as e:
-        logger.error(f"System metrics failed: {e}")
-        return jsonify({'error': 'Failed to get system metrics'}), 500
\ No newline at end of file
+        logger.error("System metrics failed: %s", e)
+        return json_response({'error': 'Failed to get system metrics'}, 500)
\ No newline at end of file
@@ -3,32 +3,57 @@ Application Configuration
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a true/false environment variable"""
+    return os.environ.get(name, str(default)).lower() == 'true'
+
+def _env_list(name: str, default: list) -> list:
+    """Read a comma-separated environment variable"""
+    value = os.environ.get(name)
+    return value.split(',') if value else default
+
 class Config:
     """Base configuration class"""
     
+    # Settings are read-only class attributes; instances carry no __dict__
+    __slots__ = ()
+    
     # Flask Configuration
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
-    DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
+    DEBUG = _env_bool('FLASK_DEBUG', False)
     
     # CORS Configuration
-    CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '').split(',') if os.environ.get('CORS_ORIGINS') else ['*']
+    CORS_ORIGINS = _env_list('CORS_ORIGINS', ['*'])
     
     # Qdrant Configuration
     QDRANT_HOST = os.environ.get('QDRANT_HOST', 'localhost')
     QDRANT_PORT = int(os.environ.get('QDRANT_PORT', '6333'))
     QDRANT_URL = f"http://{QDRANT_HOST}:{QDRANT_PORT}"
     QDRANT_API_KEY = os.environ.get('QDRANT_API_KEY')
+    QDRANT_BATCH_SEARCH = _env_bool('QDRANT_BATCH_SEARCH', False)  # needs threaded workers to coalesce
+    QDRANT_BATCH_MAX_SIZE = int(os.environ.get('QDRANT_BATCH_MAX_SIZE', '32'))
+    QDRANT_BATCH_WAIT_MS = float(os.environ.get('QDRANT_BATCH_WAIT_MS', '0'))  # 0 = no added latency
     
     # Search Configuration
     COLLECTION_NAME = os.environ.get('COLLECTION_NAME', 'semantic_search')
     VECTOR_SIZE = int(os.environ.get('VECTOR_SIZE', '384'))
     MAX_RESULTS = int(os.environ.get('MAX_RESULTS', '50'))
+    INDEX_BATCH_SIZE = int(os.environ.get('INDEX_BATCH_SIZE', '256'))  # points per upload request
+    INDEX_PARALLEL = int(os.environ.get('INDEX_PARALLEL', '4'))  # upload processes
+    INDEXING_THRESHOLD = int(os.environ.get('INDEXING_THRESHOLD', '20000'))  # restored after bulk load
+    SUGGESTION_SUBSTRING_MATCH = _env_bool('SUGGESTION_SUBSTRING_MATCH', False)
     
     # Embedding Model Configuration
     EMBEDDING_MODEL = os.environ.get('EMBEDDING_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
     MODEL_CACHE_DIR = os.environ.get('MODEL_CACHE_DIR', './models')
+    EMBEDDING_BATCH_SIZE = int(os.environ.get('EMBEDDING_BATCH_SIZE', '64'))
+    EMBEDDING_CACHE_SIZE = int(os.environ.get('EMBEDDING_CACHE_SIZE', '10000'))  # query embeddings
+    EMBEDDING_BACKEND = os.environ.get('EMBEDDING_BACKEND', 'torch')  # torch or onnx
+    ONNX_INTRA_OP_THREADS = int(os.environ.get('ONNX_INTRA_OP_THREADS', '0'))  # 0 = runtime default
+    EMBEDDING_MULTI_GPU = _env_bool('EMBEDDING_MULTI_GPU', True)  # index on every GPU when several exist
     
     # Data Configuration
     DATA_DIR = Path(os.environ.get('DATA_DIR', './data'))
@@ -41,14 +66,18 @@ class Config:
     
     # Performance Configuration
     SEARCH_TIMEOUT = int(os.environ.get('SEARCH_TIMEOUT', '30'))  # seconds
+    SEARCH_WORKERS = int(os.environ.get('SEARCH_WORKERS', '4'))  # threads for the keyword half of hybrid searches
     CACHE_TTL = int(os.environ.get('CACHE_TTL', '300'))  # seconds
     
     # Security Configuration
-    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+    RATE_LIMIT_ENABLED = _env_bool('RATE_LIMIT_ENABLED', True)
     RATE_LIMIT_PER_MINUTE = int(os.environ.get('RATE_LIMIT_PER_MINUTE', '60'))
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', '0'))  # trusted proxy hops in front; 0 = served directly
     
     # Health Check Configuration
-    HEALTH_CHECK_ENABLED = os.environ.get('HEALTH_CHECK_ENABLED', 'True').lower() == 'true'
+    HEALTH_CHECK_ENABLED = _env_bool('HEALTH_CHECK_ENABLED', True)
+    HEALTH_CHECK_INTERVAL = int(os.environ.get('HEALTH_CHECK_INTERVAL', '30'))  # seconds, per worker; matches the Docker HEALTHCHECK
+    HEALTH_SNAPSHOT_MAX_AGE = int(os.environ.get('HEALTH_SNAPSHOT_MAX_AGE', '90'))  # seconds
     
     @classmethod
     def init_directories(cls):
@@ -62,6 +91,7 @@ class Config:
 
 class ProductionConfig(Config):
     """Production configuration"""
+    __slots__ = ()
     DEBUG = False
     SECRET_KEY = os.environ.get('SECRET_KEY')
     
@@ -72,11 +102,13 @@ class ProductionConfig(Config):
 
 class DevelopmentConfig(Config):
     """Development configuration"""
+    __slots__ = ()
     DEBUG = True
 
 
 class TestingConfig(Config):
     """Testing configuration"""
+    __slots__ = ()
     TESTING = True
     DEBUG = True
     QDRANT_HOST = 'localhost'
@@ -92,9 +124,13 @@ config_map = {
     'default': DevelopmentConfig
 }
 
+# Environment name resolved once at import
+FLASK_ENV = os.environ.get('FLASK_ENV', 'default')
+
+@lru_cache(maxsize=8)
 def get_config(config_name=None):
     """Get configuration class based on environment"""
     if config_name is None:
-        config_name = os.environ.get('FLASK_ENV', 'default')
+        config_name = FLASK_ENV
     
     return config_map.get(config_name, DevelopmentConfig)
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Health Monitor
+Keeps a periodically refreshed health snapshot for the /health endpoint
+"""
+
+import time
+import logging
+import threading
+from typing import Optional, Tuple
+
+from app.core.config import Config
+from app.utils.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+class HealthMonitor:
+    """Background refresher for the serialized health status"""
+    
+    def __init__(self, search_service, config: Config = None):
+        self.search_service = search_service
+        self.config = config or Config()
+        # (body bytes, HTTP status code, unix timestamp); swapped atomically
+        self.snapshot: Optional[Tuple[bytes, int, float]] = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        # Last (overall status, Qdrant healthy) pair, so only changes get logged
+        self._last_state = None
+    
+    def refresh(self):
+        """Collect system status and store a new snapshot"""
+        timestamp = time.time()
+        try:
+            status = self.search_service.get_system_status()
+            
+            # Determine overall health
+            overall_healthy = (
+                status.get('model_loaded', False) and
+                status.get('document_count', 0) > 0
+            )
+            
+            response = {
+                'status': 'healthy' if overall_healthy else 'unhealthy',
+                'timestamp': timestamp,
+                'components': status
+            }
+            status_code = 200 if overall_healthy else 503
+            state = (response['status'], status.get('qdrant_healthy', False))
+            detail = status.get('error')
+        except Exception as e:
+            response = {
+                'status': 'unhealthy',
+                'timestamp': timestamp,
+                'error': str(e)
+            }
+            status_code = 503
+            state = ('unhealthy', False)
+            detail = str(e)
+        
+        self.snapshot = (dumps(response), status_code, timestamp)
+        self._log_state_change(state, detail)
+    
+    def _log_state_change(self, state: Tuple[str, bool], detail: Optional[str]):
+        """Log when overall or Qdrant health changes, rather than on every refresh"""
+        if state == self._last_state:
+            return
+        previous, self._last_state = self._last_state, state
+        overall, qdrant_healthy = state
+        healthy = overall == 'healthy' and qdrant_healthy
+        if previous is None and healthy:
+            return  # healthy at startup is the expected case
+        logger.log(logging.INFO if healthy else logging.WARNING,
+                   "Health changed: status=%s, qdrant_healthy=%s%s",
+                   overall, qdrant_healthy, f" ({detail})" if detail else "")
+    
+    def get_snapshot(self) -> Optional[Tuple[bytes, int, float]]:
+        """Return the latest snapshot, or None if it is missing or stale"""
+        snapshot = self.snapshot
+        if snapshot is None or time.time() - snapshot[2] > self.config.HEALTH_SNAPSHOT_MAX_AGE:
+            return None
+        return snapshot
+    
+    def start(self):
+        """Take an initial snapshot and start the refresh thread"""
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the refresh thread"""
+        self._stop_event.set()
+    
+    def _run(self):
+        """Refresh the snapshot until stopped"""
+        while not self._stop_event.wait(self.config.HEALTH_CHECK_INTERVAL):
+            self.refresh()
@@ -0,0 +1,146 @@
+"""
+ONNX Runtime Encoder
+INT8-quantized ONNX export of a sentence-transformers model for CPU inference
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from onnxruntime import SessionOptions
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from huggingface_hub import hf_hub_download
+from transformers import AutoTokenizer
+
+logger = logging.getLogger(__name__)
+
+QUANTIZED_FILE_NAME = 'model_quantized.onnx'
+
+# sentence-transformers module types the encoder can reproduce
+TRANSFORMER_MODULE = 'sentence_transformers.models.Transformer'
+POOLING_MODULE = 'sentence_transformers.models.Pooling'
+NORMALIZE_MODULE = 'sentence_transformers.models.Normalize'
+
+# Pooling config flag -> pooling mode implemented in OnnxEncoder.encode
+POOLING_MODES = {
+    'pooling_mode_cls_token': 'cls',
+    'pooling_mode_mean_tokens': 'mean',
+    'pooling_mode_max_tokens': 'max'
+}
+
+def _read_model_json(model_name: str, filename: str, cache_dir: str) -> dict:
+    """Read a JSON file from a local model directory or the Hugging Face Hub"""
+    local_dir = Path(model_name)
+    if local_dir.is_dir():
+        path = local_dir / filename
+    else:
+        path = hf_hub_download(repo_id=model_name, filename=filename, cache_dir=cache_dir)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def read_pipeline_config(model_name: str, cache_dir: str) -> Tuple[str, bool, Optional[int]]:
+    """Return (pooling mode, normalize, max sequence length) of a sentence-transformers model"""
+    # Refuse pipelines the encoder can't reproduce, so query embeddings never
+    # silently differ from documents indexed with the PyTorch backend
+    modules = _read_model_json(model_name, 'modules.json', cache_dir)
+    types = [module['type'] for module in modules]
+    unsupported = [t for t in types if t not in (TRANSFORMER_MODULE, POOLING_MODULE, NORMALIZE_MODULE)]
+    if unsupported or types[:2] != [TRANSFORMER_MODULE, POOLING_MODULE]:
+        raise ValueError(f"Unsupported sentence-transformers pipeline for ONNX backend: {types}")
+    
+    pooling_config = _read_model_json(model_name, f"{modules[1]['path']}/config.json", cache_dir)
+    enabled = [flag for flag, value in pooling_config.items() if flag.startswith('pooling_mode_') and value]
+    if len(enabled) != 1 or enabled[0] not in POOLING_MODES:
+        raise ValueError(f"Unsupported pooling for ONNX backend: {enabled}")
+    
+    max_seq_length = _read_model_json(model_name, 'sentence_bert_config.json', cache_dir).get('max_seq_length')
+    return POOLING_MODES[enabled[0]], NORMALIZE_MODULE in types, max_seq_length
+
+class OnnxEncoder:
+    """Drop-in replacement for SentenceTransformer.encode backed by ONNX Runtime"""
+    
+    def __init__(self, model_name: str, cache_dir: str, num_threads: int = 0):
+        # Match the model's own pooling, normalization and truncation
+        self.pooling, self.normalize, self.max_seq_length = read_pipeline_config(model_name, cache_dir)
+        export_dir = Path(cache_dir) / 'onnx' / model_name.replace('/', '__')
+        
+        # Export and quantize once; later starts load the saved INT8 model
+        if not (export_dir / QUANTIZED_FILE_NAME).exists():
+            self._export(model_name, cache_dir, export_dir)
+        
+        session_options = SessionOptions()
+        session_options.intra_op_num_threads = num_threads  # 0 lets ONNX Runtime decide
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            export_dir,
+            file_name=QUANTIZED_FILE_NAME,
+            provider='CPUExecutionProvider',
+            session_options=session_options
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        if self.max_seq_length is None:
+            # sentence-transformers falls back to the tokenizer's limit too
+            self.max_seq_length = self.tokenizer.model_max_length
+    
+    @staticmethod
+    def _export(model_name: str, cache_dir: str, export_dir: Path):
+        """Export and quantize into a private directory, then rename it into place"""
+        logger.info("Exporting %s to ONNX with INT8 dynamic quantization", model_name)
+        export_dir.parent.mkdir(parents=True, exist_ok=True)
+        # Workers starting together each build their own copy; the first rename wins
+        tmp_dir = Path(tempfile.mkdtemp(dir=export_dir.parent, prefix=export_dir.name + '.'))
+        try:
+            model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True, cache_dir=cache_dir)
+            model.save_pretrained(tmp_dir)
+            AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir).save_pretrained(tmp_dir)
+            quantizer = ORTQuantizer.from_pretrained(tmp_dir)
+            quantizer.quantize(
+                save_dir=tmp_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+            os.rename(tmp_dir, export_dir)
+        except OSError:
+            if not (export_dir / QUANTIZED_FILE_NAME).exists():
+                raise
+            logger.info("Using ONNX export of %s completed by another process", model_name)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               convert_to_numpy: bool = True, show_progress_bar: bool = False) -> np.ndarray:
+        """Pool and optionally L2-normalize token embeddings, like the sentence-transformers pipeline"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            hidden = self.model(**inputs).last_hidden_state
+            pooled = self._pool(hidden, inputs['attention_mask'])
+            if self.normalize:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+        
+        embeddings = np.concatenate(batches) if batches else np.empty((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+    
+    def _pool(self, hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Reduce (batch, tokens, dim) hidden states to (batch, dim) over non-padding tokens"""
+        if self.pooling == 'cls':
+            return hidden[:, 0].copy()
+        
+        mask = attention_mask[..., np.newaxis].astype(hidden.dtype)
+        if self.pooling == 'max':
+            return np.where(mask > 0, hidden, np.finfo(hidden.dtype).min).max(axis=1)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
@@ -0,0 +1,81 @@
+"""
+Qdrant Search Batcher
+Coalesces concurrent semantic searches into Qdrant batch-search calls
+"""
+
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import List
+
+from qdrant_client.models import SearchRequest
+
+logger = logging.getLogger(__name__)
+
+# Only pays off when a process serves concurrent requests (e.g. gunicorn gthread
+# workers); with sync workers every batch holds a single search.
+class SearchBatcher:
+    """Background worker that sends queued searches to Qdrant with search_batch"""
+    
+    def __init__(self, client, collection_name: str, max_batch_size: int = 32, max_wait_ms: float = 0):
+        self.client = client
+        self.collection_name = collection_name
+        self.max_batch_size = max_batch_size
+        # 0 batches opportunistically: whatever queued up while the previous call ran
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='qdrant-search-batcher', daemon=True)
+        self._thread.start()
+    
+    def search(self, vector: List[float], limit: int, timeout: float = None):
+        """Queue a search and block until its batch returns"""
+        future = Future()
+        self._queue.put((vector, limit, future))
+        return future.result(timeout)
+    
+    def _next_batch(self) -> list:
+        """Wait for one queued search, then collect more up to the size and wait limits"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        """Serve queued searches until the process exits"""
+        while True:
+            batch = self._next_batch()
+            try:
+                results = self.client.search_batch(
+                    collection_name=self.collection_name,
+                    requests=[
+                        SearchRequest(vector=vector, limit=limit, with_payload=True)
+                        for vector, limit, _ in batch
+                    ]
+                )
+            except Exception as e:
+                logger.warning("Batched Qdrant search failed, retrying searches individually: %s", e)
+                self._search_individually(batch)
+                continue
+            
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+    
+    def _search_individually(self, batch: list):
+        """Run each search on its own, so one bad request only fails its own caller"""
+        for vector, limit, future in batch:
+            try:
+                future.set_result(self.client.search(
+                    collection_name=self.collection_name,
+                    query_vector=vector,
+                    limit=limit,
+                    with_payload=True
+                ))
+            except Exception as e:
+                future.set_exception(e)
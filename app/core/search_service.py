@@ -3,36 +3,116 @@ Search Service Implementation
 Handles all search operations using Qdrant vector database
 """
 
-import json
+import os
 import time
+import contextlib
 import logging
-import hashlib
+import tempfile
+import zlib
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import numpy as np
+import orjson
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
-from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import Distance, VectorParams, PointStruct, OptimizersConfigDiff
+from qdrant_client.http.exceptions import UnexpectedResponse, ResponseHandlingException
 
 from app.core.config import Config
+from app.core.search_batcher import SearchBatcher
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+def _default_file_mode() -> int:
+    """Permissions a plain open() would give a new file under the current umask"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+# Read once at import, as reading the umask briefly changes it process-wide
+DEFAULT_FILE_MODE = _default_file_mode()
+
+def _replace_atomically(path: Path, write) -> None:
+    """Write a file through a uniquely named temporary file, then move it into place"""
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + '.', suffix='.tmp', delete=False)
+    try:
+        with tmp:
+            write(tmp)
+        # NamedTemporaryFile creates 0600 files; other runtime users must be able to read the cache
+        os.chmod(tmp.name, DEFAULT_FILE_MODE)
+        os.replace(tmp.name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp.name)
+        raise
+
+# Errors raised by Qdrant client calls when the server or collection is unavailable
+QDRANT_ERRORS = (UnexpectedResponse, ResponseHandlingException, ConnectionError, TimeoutError)
+
+# Bump when _get_hash_embeddings changes, so saved fallback doc matrices are rebuilt
+HASH_EMBEDDING_VERSION = 1
+
+def _count_overlaps_numpy(query_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray, n_docs: int) -> np.ndarray:
+    """Count query-term hits per document from CSR posting lists"""
+    overlaps = np.zeros(n_docs, dtype=np.int32)
+    for term in query_ids:
+        overlaps[indices[indptr[term]:indptr[term + 1]]] += 1
+    return overlaps
+
+def _count_overlaps_loop(query_ids, indptr, indices, n_docs):
+    """Scalar version of _count_overlaps_numpy for Numba compilation"""
+    overlaps = np.zeros(n_docs, dtype=np.int32)
+    for term in query_ids:
+        for k in range(indptr[term], indptr[term + 1]):
+            overlaps[indices[k]] += 1
+    return overlaps
+
+# Use the compiled loop when Numba is installed
+count_overlaps = njit(cache=True)(_count_overlaps_loop) if njit else _count_overlaps_numpy
+
 class SearchService:
     """Main search service class"""
     
+    # Seconds to reuse a Qdrant get_collection response
+    COLLECTION_INFO_TTL = 5
+    
     def __init__(self, config: Config = None):
         self.config = config or Config()
         self.client = None
+        self.search_batcher = None
         self.model = None
-        self.embedding_cache = {}
+        # Query text -> read-only float32 embedding, least recently used first
+        self.embedding_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Runs the keyword half of hybrid searches alongside the semantic half
+        self._pool = ThreadPoolExecutor(max_workers=self.config.SEARCH_WORKERS, thread_name_prefix='search')
+        self._doc_index = {}
+        # Fallback embeddings, built on first use since they are only needed without Qdrant
+        self._doc_matrix = None
+        self._doc_matrix_lock = threading.Lock()
+        self._doc_matrix_source = None  # (data file, its stat) the doc matrix cache is validated against
+        self.vocab = {}
+        self.postings_indptr = np.zeros(1, dtype=np.int64)
+        self.postings_indices = np.empty(0, dtype=np.int32)
+        self._collection_info = None
+        self._collection_info_expires = 0.0
         self.sample_data = []
         
         # Initialize components
         self._initialize_client()
         self._initialize_model()
         self._load_sample_data()
+        if not self.client:
+            # Searches will use the in-memory fallback from the start, so build it now
+            _ = self.doc_matrix
     
     def _initialize_client(self):
         """Initialize Qdrant client"""
@@ -51,6 +131,15 @@ class SearchService:
             # Create collection if it doesn't exist
             self._ensure_collection_exists()
             
+            # Coalesce concurrent semantic searches into batch requests
+            if self.config.QDRANT_BATCH_SEARCH:
+                self.search_batcher = SearchBatcher(
+                    self.client,
+                    self.config.COLLECTION_NAME,
+                    max_batch_size=self.config.QDRANT_BATCH_MAX_SIZE,
+                    max_wait_ms=self.config.QDRANT_BATCH_WAIT_MS
+                )
+            
         except Exception as e:
             logger.error(f"❌ Failed to connect to Qdrant: {e}")
             # For development, use in-memory search
@@ -58,6 +147,21 @@ class SearchService:
     
     def _initialize_model(self):
         """Initialize embedding model"""
+        if self.config.EMBEDDING_BACKEND == 'onnx':
+            try:
+                from app.core.onnx_encoder import OnnxEncoder
+                self.model = OnnxEncoder(
+                    self.config.EMBEDDING_MODEL,
+                    cache_dir=self.config.MODEL_CACHE_DIR,
+                    num_threads=self.config.ONNX_INTRA_OP_THREADS
+                )
+                logger.info(f"✅ Loaded INT8 ONNX embedding model: {self.config.EMBEDDING_MODEL}")
+                return
+            except ImportError as e:
+                logger.warning(f"ONNX Runtime not available, using PyTorch model: {e}")
+            except Exception as e:
+                logger.error(f"❌ Failed to load ONNX embedding model, using PyTorch model: {e}")
+        
         try:
             self.model = SentenceTransformer(
                 self.config.EMBEDDING_MODEL,
@@ -80,7 +184,9 @@ class SearchService:
                     vectors_config=VectorParams(
                         size=self.config.VECTOR_SIZE,
                         distance=Distance.COSINE
-                    )
+                    ),
+                    # Few large segments suit batched reads
+                    optimizers_config=OptimizersConfigDiff(default_segment_number=2)
                 )
                 logger.info(f"✅ Created collection: {self.config.COLLECTION_NAME}")
             else:
@@ -88,16 +194,126 @@ class SearchService:
         except Exception as e:
             logger.error(f"❌ Failed to ensure collection exists: {e}")
     
+    @property
+    def sample_data(self) -> List[Dict]:
+        """Loaded documents"""
+        return self._sample_data
+    
+    @sample_data.setter
+    def sample_data(self, documents: List[Dict]):
+        """Replace loaded documents and rebuild the derived indexes"""
+        self._sample_data = documents
+        self._doc_index = {doc['id']: doc for doc in documents}
+        with self._doc_matrix_lock:
+            self._doc_matrix = None
+        self.vocab, self.postings_indptr, self.postings_indices = self._build_postings(self._document_texts(documents))
+    
+    @property
+    def doc_matrix(self) -> np.ndarray:
+        """Fallback document embeddings, loaded or built on first access"""
+        doc_matrix = self._doc_matrix
+        if doc_matrix is None:
+            with self._doc_matrix_lock:
+                if self._doc_matrix is None:
+                    self._doc_matrix = self._load_or_build_doc_matrix(self._sample_data)
+                doc_matrix = self._doc_matrix
+        return doc_matrix
+    
+    @staticmethod
+    def _document_texts(documents: List[Dict]) -> List[str]:
+        """Text indexed for each document"""
+        return [doc['title'] + ' ' + doc['content'] for doc in documents]
+    
+    def _build_doc_matrix(self, texts: List[str]) -> np.ndarray:
+        """Build the L2-normalized (N, D) float32 matrix of fallback document embeddings"""
+        doc_matrix = self._get_hash_embeddings(texts)
+        
+        norms = np.linalg.norm(doc_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        doc_matrix /= norms
+        return doc_matrix
+    
+    def _load_or_build_doc_matrix(self, documents: List[Dict]) -> np.ndarray:
+        """Memory-map the saved doc matrix if it matches the source data, else build and save it"""
+        if self._doc_matrix_source is None:
+            return self._build_doc_matrix(self._document_texts(documents))
+        
+        source, source_stat = self._doc_matrix_source
+        matrix_file = source.with_name('doc_matrix.npy')
+        ids_file = source.with_name('doc_ids.npy')
+        meta_file = source.with_name('doc_matrix.meta.json')
+        # Identifies the passages file the cache was built from
+        fingerprint = {
+            'source_size': source_stat.st_size,
+            'source_mtime_ns': source_stat.st_mtime_ns,
+            'vector_size': self.config.VECTOR_SIZE,
+            'hash_embedding_version': HASH_EMBEDDING_VERSION
+        }
+        ids = [doc['id'] for doc in documents]
+        try:
+            if orjson.loads(meta_file.read_bytes()) == fingerprint:
+                doc_matrix = np.load(matrix_file, mmap_mode='r')
+                if (doc_matrix.shape == (len(documents), self.config.VECTOR_SIZE)
+                        and doc_matrix.dtype == np.float32
+                        and np.load(ids_file).tolist() == ids):
+                    logger.info(f"✅ Mapped document matrix from {matrix_file}")
+                    return doc_matrix
+        except (OSError, ValueError):
+            pass  # missing or unreadable cache, rebuild below
+        
+        doc_matrix = self._build_doc_matrix(self._document_texts(documents))
+        try:
+            # Metadata goes last, so it only matches once both arrays are in place
+            _replace_atomically(ids_file, lambda f: np.save(f, np.array(ids, dtype=str)))
+            _replace_atomically(matrix_file, lambda f: np.save(f, doc_matrix))
+            _replace_atomically(meta_file, lambda f: f.write(orjson.dumps(fingerprint)))
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save document matrix cache: {e}")
+        return doc_matrix
+    
+    def _build_postings(self, texts: List[str]) -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+        """Build the inverted index as CSR arrays: token id -> rows of documents containing it"""
+        postings = defaultdict(list)
+        for row, text in enumerate(texts):
+            for token in set(text.lower().split()):
+                postings[token].append(row)
+        
+        vocab = {token: term_id for term_id, token in enumerate(postings)}
+        indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(rows) for rows in postings.values()])
+        indices = np.fromiter(
+            (row for rows in postings.values() for row in rows),
+            dtype=np.int32,
+            count=int(indptr[-1])
+        )
+        return vocab, indptr, indices
+    
+    def get_collection_info(self):
+        """Get Qdrant collection info, reusing a recent response"""
+        now = time.monotonic()
+        if self._collection_info is None or now >= self._collection_info_expires:
+            # Failures propagate without replacing the cached value
+            self._collection_info = self.client.get_collection(self.config.COLLECTION_NAME)
+            self._collection_info_expires = now + self.COLLECTION_INFO_TTL
+        return self._collection_info
+    
+    def get_document(self, doc_id: str) -> Optional[Dict]:
+        """Look up a loaded document by ID"""
+        return self._doc_index.get(doc_id)
+    
     def _load_sample_data(self):
         """Load sample data for demonstration"""
         try:
             # Load from processed data if available
             processed_file = self.config.PROCESSED_DIR / 'passages.jsonl'
             if processed_file.exists():
-                with open(processed_file, 'r') as f:
-                    for line in f:
-                        if line.strip():
-                            self.sample_data.append(json.loads(line))
+                # Stat before reading so a concurrent rewrite can't pair old data with a new fingerprint
+                self._doc_matrix_source = (processed_file, processed_file.stat())
+                self.sample_data = [
+                    orjson.loads(line)
+                    for line in processed_file.read_bytes().splitlines()
+                    if line.strip()
+                ]
                 logger.info(f"✅ Loaded {len(self.sample_data)} documents from processed data")
             else:
                 # Create sample data
@@ -105,6 +321,7 @@ class SearchService:
                 logger.info(f"✅ Created {len(self.sample_data)} sample documents")
         except Exception as e:
             logger.error(f"❌ Failed to load sample data: {e}")
+            self._doc_matrix_source = None
             self.sample_data = self._create_sample_data()
     
     def _create_sample_data(self) -> List[Dict]:
@@ -122,6 +339,9 @@ class SearchService:
             "Robotics and Automation"
         ]
         
+        # One creation time for the whole generated set
+        timestamp = int(time.time())
+        
         sample_docs = []
         for i, topic in enumerate(topics):
             for j in range(50):  # 50 docs per topic
@@ -138,7 +358,7 @@ class SearchService:
                     'title': title,
                     'content': content,
                     'topic': topic,
-                    'timestamp': int(time.time()),
+                    'timestamp': timestamp,
                     'url': f"https://example.com/research/{doc_id}"
                 })
         
@@ -151,44 +371,118 @@ class SearchService:
             return self._get_hash_embedding(query_text)
         
         try:
-            # Check cache first
-            cache_key = hashlib.md5(query_text.encode()).hexdigest()
-            if cache_key in self.embedding_cache:
-                return self.embedding_cache[cache_key]
+            # Check cache first (str hashes are cached, so the text is its own key)
+            embedding = self._cache_get(query_text)
+            if embedding is not None:
+                return embedding
             
-            # Generate embedding
-            embedding = self.model.encode(query_text)
-            
-            # Cache the result
-            self.embedding_cache[cache_key] = embedding
-            
-            return embedding
+            # Generate and cache embedding
+            return self._cache_put(query_text, self.model.encode(query_text))
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             return self._get_hash_embedding(query_text)
     
+    def _cache_get(self, text: str) -> Optional[np.ndarray]:
+        """Look up a cached embedding and mark it recently used"""
+        with self._cache_lock:
+            embedding = self.embedding_cache.get(text)
+            if embedding is not None:
+                self.embedding_cache.move_to_end(text)
+            return embedding
+    
+    def _cache_put(self, text: str, embedding: np.ndarray) -> np.ndarray:
+        """Cache an embedding as read-only float32, evicting the least recently used"""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        with self._cache_lock:
+            self.embedding_cache[text] = embedding
+            self.embedding_cache.move_to_end(text)
+            while len(self.embedding_cache) > self.config.EMBEDDING_CACHE_SIZE:
+                self.embedding_cache.popitem(last=False)
+        return embedding
+    
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the embedding model in batches, as float32"""
+        # SentenceTransformer.encode already length-sorts texts within the call
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.config.EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        # No copy when the backend already returns float32
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    def _encode_documents(self, texts: List[str]) -> np.ndarray:
+        """Encode documents for indexing, spread over all GPUs when there are several"""
+        if self.config.EMBEDDING_MULTI_GPU and hasattr(self.model, 'start_multi_process_pool'):
+            import torch
+            if torch.cuda.device_count() > 1:
+                # One worker process per GPU, each encoding its own chunks of the corpus
+                pool = self.model.start_multi_process_pool()
+                try:
+                    embeddings = self.model.encode_multi_process(
+                        texts,
+                        pool,
+                        batch_size=self.config.EMBEDDING_BATCH_SIZE
+                    )
+                finally:
+                    self.model.stop_multi_process_pool(pool)
+                return np.asarray(embeddings, dtype=np.float32)
+        
+        return self._encode_texts(texts)
+    
     def _get_hash_embedding(self, text: str) -> np.ndarray:
         """Generate hash-based embedding as fallback"""
-        # Simple hash-based embedding for demonstration
-        hash_val = hashlib.md5(text.encode()).hexdigest()
-        np.random.seed(int(hash_val[:8], 16))
-        return np.random.rand(self.config.VECTOR_SIZE)
-    
-    def search_semantic(self, query_text: str, max_results: int = 10) -> Dict[str, Any]:
-        """Perform semantic search"""
-        start_time = time.time()
+        return self._get_hash_embeddings([text])[0]
+    
+    def _get_hash_embeddings(self, texts: List[str], chunk_size: int = 4096) -> np.ndarray:
+        """Generate hash-based fallback embeddings for many texts in vectorized chunks"""
+        # Simple hash-based embedding for demonstration: each value is a
+        # splitmix64 hash of (crc32 of the text, dimension index), scaled to [0, 1)
+        seeds = np.fromiter((zlib.crc32(text.encode()) for text in texts), dtype=np.uint64, count=len(texts))
+        dims = np.arange(self.config.VECTOR_SIZE, dtype=np.uint64)
+        embeddings = np.empty((len(texts), self.config.VECTOR_SIZE), dtype=np.float32)
+        for start in range(0, len(texts), chunk_size):
+            x = (seeds[start:start + chunk_size, np.newaxis] << np.uint64(32)) | dims
+            x ^= x >> np.uint64(30)
+            x *= np.uint64(0xBF58476D1CE4E5B9)
+            x ^= x >> np.uint64(27)
+            x *= np.uint64(0x94D049BB133111EB)
+            x ^= x >> np.uint64(31)
+            embeddings[start:start + chunk_size] = (x >> np.uint64(40)).astype(np.float32) * np.float32(2.0 ** -24)
+        return embeddings
+    
+    def _prepare_query(self, query_text: str) -> np.ndarray:
+        """Get the query embedding as an L2-normalized float32 vector"""
+        query_vector = np.array(self.get_query_embeddings(query_text), dtype=np.float32)
+        query_vector /= max(np.linalg.norm(query_vector), 1e-12)
+        return query_vector
+    
+    def search_semantic(self, query_text: str, max_results: int = 10,
+                        query_vector: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Perform semantic search, optionally with a vector from _prepare_query"""
+        start_time = time.perf_counter_ns()
         
         try:
-            # Get query embedding
-            query_embedding = self.get_query_embeddings(query_text)
+            # Get normalized query embedding
+            if query_vector is None:
+                query_vector = self._prepare_query(query_text)
             
             if self.client:
                 # Search using Qdrant
-                results = self.client.search(
-                    collection_name=self.config.COLLECTION_NAME,
-                    query_vector=query_embedding.tolist(),
-                    limit=max_results
-                )
+                if self.search_batcher:
+                    results = self.search_batcher.search(
+                        query_vector.tolist(),
+                        max_results,
+                        timeout=self.config.SEARCH_TIMEOUT
+                    )
+                else:
+                    results = self.client.search(
+                        collection_name=self.config.COLLECTION_NAME,
+                        query_vector=query_vector.tolist(),
+                        limit=max_results
+                    )
                 
                 # Format results
                 formatted_results = []
@@ -203,9 +497,9 @@ class SearchService:
                     })
             else:
                 # Fallback to in-memory search
-                formatted_results = self._search_in_memory(query_text, query_embedding, max_results)
+                formatted_results = self._search_in_memory(query_text, query_vector, max_results)
             
-            search_time = (time.time() - start_time) * 1000
+            search_time = (time.perf_counter_ns() - start_time) / 1e6
             
             return {
                 'name': 'Semantic Search',
@@ -228,44 +522,36 @@ class SearchService:
     
     def search_keyword(self, query_text: str, max_results: int = 10) -> Dict[str, Any]:
         """Perform keyword-based search"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
-            # Simple keyword matching on sample data
+            # Count matching query words per document from the posting lists
             query_words = set(query_text.lower().split())
-            results = []
-            
-            for doc in self.sample_data:
-                # Calculate keyword overlap score
-                doc_words = set((doc['title'] + ' ' + doc['content']).lower().split())
-                overlap = len(query_words.intersection(doc_words))
-                
-                if overlap > 0:
-                    # Simple TF-IDF like scoring
-                    score = overlap / len(query_words)
-                    results.append({
-                        'doc': doc,
-                        'score': score
-                    })
+            query_ids = np.array(
+                [self.vocab[word] for word in query_words if word in self.vocab],
+                dtype=np.int64
+            )
+            overlaps = count_overlaps(query_ids, self.postings_indptr, self.postings_indices, len(self.sample_data))
             
-            # Sort by score and limit results
-            results.sort(key=lambda x: x['score'], reverse=True)
-            results = results[:max_results]
+            # Rank matching documents by overlap, keeping document order on ties
+            top_rows = self._top_k_rows(overlaps, max_results)
             
             # Format results
             formatted_results = []
-            for result in results:
-                doc = result['doc']
+            for row in top_rows:
+                doc = self.sample_data[row]
+                # Simple TF-IDF like scoring
+                score = overlaps[row] / len(query_words)
                 formatted_results.append({
                     'id': doc['id'],
                     'title': doc['title'],
                     'content': self._truncate_content(doc['content']),
                     'url': doc['url'],
-                    'relevance': round(result['score'], 4),
-                    'timestamp': doc['timestamp']
+                    'relevance': round(float(score), 4),
+                    'timestamp': doc.get('timestamp', 0)
                 })
             
-            search_time = (time.time() - start_time) * 1000
+            search_time = (time.perf_counter_ns() - start_time) / 1e6
             
             return {
                 'name': 'Keyword Search',
@@ -286,55 +572,49 @@ class SearchService:
                 'color': '#DC2626'
             }
     
-    def search_hybrid(self, query_text: str, max_results: int = 10) -> Dict[str, Any]:
+    def search_hybrid(self, query_text: str, max_results: int = 10,
+                      query_vector: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Perform hybrid search (semantic + keyword)"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
-            # Get results from both approaches
-            semantic_results = self.search_semantic(query_text, max_results * 2)
-            keyword_results = self.search_keyword(query_text, max_results * 2)
+            # Get results from both approaches concurrently: keyword scoring (short, CPU-bound)
+            # runs in the pool while the Qdrant round trip stays on the request thread, so a
+            # slow Qdrant call never holds a pool slot
+            keyword_future = self._pool.submit(self.search_keyword, query_text, max_results * 2)
+            semantic_results = self.search_semantic(query_text, max_results * 2, query_vector)
+            keyword_results = keyword_future.result()
             
-            # Combine and re-rank results
-            combined_results = {}
+            # Combine and re-rank results: index each document once (semantic
+            # result first, as it carries the payload we return), then score
+            # with dense arrays instead of per-document dicts
+            semantic_hits = semantic_results['results']
+            keyword_hits = keyword_results['results']
+            id_to_idx = {}
+            candidates = []
+            for result in semantic_hits + keyword_hits:
+                if result['id'] not in id_to_idx:
+                    id_to_idx[result['id']] = len(candidates)
+                    candidates.append(result)
             
-            # Add semantic results with weight
-            for result in semantic_results['results']:
-                doc_id = result['id']
-                if doc_id not in combined_results:
-                    combined_results[doc_id] = result.copy()
-                    combined_results[doc_id]['semantic_score'] = result['relevance']
-                    combined_results[doc_id]['keyword_score'] = 0
-                    combined_results[doc_id]['hybrid_score'] = result['relevance'] * 0.7
+            semantic_scores = np.zeros(len(candidates))
+            keyword_scores = np.zeros(len(candidates))
+            for result in semantic_hits:
+                semantic_scores[id_to_idx[result['id']]] = result['relevance']
+            for result in keyword_hits:
+                keyword_scores[id_to_idx[result['id']]] = result['relevance']
+            hybrid_scores = 0.7 * semantic_scores + 0.3 * keyword_scores
             
-            # Add keyword results with weight
-            for result in keyword_results['results']:
-                doc_id = result['id']
-                if doc_id in combined_results:
-                    combined_results[doc_id]['keyword_score'] = result['relevance']
-                    combined_results[doc_id]['hybrid_score'] += result['relevance'] * 0.3
-                else:
-                    combined_results[doc_id] = result.copy()
-                    combined_results[doc_id]['semantic_score'] = 0
-                    combined_results[doc_id]['keyword_score'] = result['relevance']
-                    combined_results[doc_id]['hybrid_score'] = result['relevance'] * 0.3
-            
-            # Sort by hybrid score and format
-            sorted_results = sorted(
-                combined_results.values(),
-                key=lambda x: x['hybrid_score'],
-                reverse=True
-            )[:max_results]
+            # Top-k by hybrid score; a stable sort keeps ties in first-seen order
+            top = np.argsort(-hybrid_scores, kind='stable')[:max(max_results, 0)]
             
-            # Clean up results
-            for result in sorted_results:
-                result['relevance'] = round(result['hybrid_score'], 4)
-                # Remove intermediate scores
-                result.pop('semantic_score', None)
-                result.pop('keyword_score', None)
-                result.pop('hybrid_score', None)
+            # Materialize output dicts only for the survivors
+            sorted_results = [
+                {**candidates[i], 'relevance': round(float(hybrid_scores[i]), 4)}
+                for i in top.tolist()
+            ]
             
-            search_time = (time.time() - start_time) * 1000
+            search_time = (time.perf_counter_ns() - start_time) / 1e6
             
             return {
                 'name': 'Hybrid Search',
@@ -355,52 +635,60 @@ class SearchService:
                 'color': '#7C2D12'
             }
     
-    def _search_in_memory(self, query_text: str, query_embedding: np.ndarray, max_results: int) -> List[Dict]:
-        """Fallback in-memory search"""
-        results = []
+    @staticmethod
+    def _top_k_rows(overlaps: np.ndarray, k: int) -> np.ndarray:
+        """Rows of the k highest non-zero overlaps, ties broken by lower row first"""
+        matched_rows = np.flatnonzero(overlaps)
+        if k < 1 or not len(matched_rows):
+            return matched_rows[:0]
         
-        for doc in self.sample_data:
-            # Generate document embedding
-            doc_embedding = self._get_hash_embedding(doc['title'] + ' ' + doc['content'])
-            
-            # Calculate cosine similarity
-            similarity = np.dot(query_embedding, doc_embedding) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(doc_embedding)
-            )
-            
-            results.append({
-                'doc': doc,
-                'score': similarity
-            })
+        # Unique rank key: higher overlap first, then lower row
+        rank_keys = -overlaps[matched_rows].astype(np.int64) * len(overlaps) + matched_rows
+        if len(matched_rows) > k:
+            partition = np.argpartition(rank_keys, k - 1)[:k]
+            matched_rows, rank_keys = matched_rows[partition], rank_keys[partition]
+        return matched_rows[np.argsort(rank_keys)]
+    
+    def _search_in_memory(self, query_text: str, query_vector: np.ndarray, max_results: int) -> List[Dict]:
+        """Fallback in-memory search with a normalized query vector"""
+        if not len(self.doc_matrix) or max_results < 1:
+            return []
         
-        # Sort by similarity and limit results
-        results.sort(key=lambda x: x['score'], reverse=True)
-        results = results[:max_results]
+        # Cosine similarity against every document in one matrix-vector product
+        scores = self.doc_matrix @ query_vector
+        
+        # Select the top results without sorting every score
+        k = min(max_results, len(scores))
+        top_rows = np.argpartition(-scores, k - 1)[:k]
+        top_rows = top_rows[np.argsort(-scores[top_rows])]
         
         # Format results
         formatted_results = []
-        for result in results:
-            doc = result['doc']
+        for row in top_rows:
+            doc = self.sample_data[row]
             formatted_results.append({
                 'id': doc['id'],
                 'title': doc['title'],
                 'content': self._truncate_content(doc['content']),
                 'url': doc['url'],
-                'relevance': round(result['score'], 4),
-                'timestamp': doc['timestamp']
+                'relevance': round(float(scores[row]), 4),
+                'timestamp': doc.get('timestamp', 0)
             })
         
         return formatted_results
     
+    def iter_approaches(self, query_text: str, max_results: int = 10):
+        """Yield (approach name, results) for each approach, embedding the query once"""
+        query_vector = self._prepare_query(query_text)
+        yield 'semantic', self.search_semantic(query_text, max_results, query_vector)
+        yield 'keyword', self.search_keyword(query_text, max_results)
+        yield 'hybrid', self.search_hybrid(query_text, max_results, query_vector)
+    
     def search_all_approaches(self, query_text: str, max_results: int = 10) -> Dict[str, Any]:
         """Search using all available approaches"""
         return {
             'query': query_text,
-            'approaches': {
-                'semantic': self.search_semantic(query_text, max_results),
-                'keyword': self.search_keyword(query_text, max_results),
-                'hybrid': self.search_hybrid(query_text, max_results)
-            }
+            'approaches': dict(self.iter_approaches(query_text, max_results))
         }
     
     def _truncate_content(self, content: str, max_length: int = 200) -> str:
@@ -427,18 +715,21 @@ class SearchService:
                 
                 # Get collection info
                 try:
-                    collection_info = self.client.get_collection(self.config.COLLECTION_NAME)
+                    collection_info = self.get_collection_info()
                     status['collection_info'] = {
-                        'name': collection_info.name,
+                        'name': self.config.COLLECTION_NAME,
                         'status': collection_info.status,
                         'vectors_count': collection_info.vectors_count,
                         'indexed_vectors_count': collection_info.indexed_vectors_count
                     }
-                except:
+                except QDRANT_ERRORS as e:
+                    # Polled by the health monitor, which logs state changes instead
+                    logger.debug("Collection info fetch failed: %s", e)
                     status['collection_info'] = {'name': self.config.COLLECTION_NAME, 'status': 'not_found'}
         except Exception as e:
-            logger.error(f"Health check failed: {e}")
+            logger.debug("Health check failed: %s", e)
             status['qdrant_healthy'] = False
+            status['error'] = str(e)
         
         return status
     
@@ -449,26 +740,43 @@ class SearchService:
             return False
         
         try:
-            points = []
-            for doc in documents:
-                # Generate embedding for document
-                doc_text = f"{doc['title']} {doc['content']}"
-                embedding = self.get_query_embeddings(doc_text)
-                
-                point = PointStruct(
+            # Generate embeddings for all documents in one batched call
+            doc_texts = [f"{doc['title']} {doc['content']}" for doc in documents]
+            if self.model:
+                embeddings = self._encode_documents(doc_texts)
+            else:
+                embeddings = self._get_hash_embeddings(doc_texts)
+            
+            points = (
+                PointStruct(
                     id=doc['id'],
                     vector=embedding.tolist(),
                     payload=doc
                 )
-                points.append(point)
+                for doc, embedding in zip(documents, embeddings)
+            )
             
-            # Index to Qdrant
-            self.client.upsert(
+            # Defer HNSW indexing during the bulk load, then restore it
+            self.client.update_collection(
                 collection_name=self.config.COLLECTION_NAME,
-                points=points
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=0)
             )
+            try:
+                # Index to Qdrant in parallel batches without waiting on each one
+                self.client.upload_points(
+                    collection_name=self.config.COLLECTION_NAME,
+                    points=points,
+                    batch_size=self.config.INDEX_BATCH_SIZE,
+                    parallel=self.config.INDEX_PARALLEL,
+                    wait=False
+                )
+            finally:
+                self.client.update_collection(
+                    collection_name=self.config.COLLECTION_NAME,
+                    optimizers_config=OptimizersConfigDiff(indexing_threshold=self.config.INDEXING_THRESHOLD)
+                )
             
-            logger.info(f"✅ Indexed {len(points)} documents")
+            logger.info(f"✅ Indexed {len(documents)} documents")
             return True
             
         except Exception as e:
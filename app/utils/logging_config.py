@@ -2,8 +2,10 @@
 Logging Configuration
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 from pathlib import Path
 from app.core.config import Config
 
@@ -15,20 +17,32 @@ def setup_logging():
     log_dir = Path(config.LOG_FILE).parent
     log_dir.mkdir(exist_ok=True)
     
+    # Console and rotating file handlers do the actual I/O
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        # Console handler
+        logging.StreamHandler(),
+        # File handler with rotation
+        logging.handlers.RotatingFileHandler(
+            config.LOG_FILE,
+            maxBytes=10*1024*1024,  # 10MB
+            backupCount=5
+        )
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # Request threads only enqueue records; a listener thread formats and writes them
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
     # Configure logging
     logging.basicConfig(
         level=getattr(logging, config.LOG_LEVEL),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            # Console handler
-            logging.StreamHandler(),
-            # File handler with rotation
-            logging.handlers.RotatingFileHandler(
-                config.LOG_FILE,
-                maxBytes=10*1024*1024,  # 10MB
-                backupCount=5
-            )
-        ]
+        format='%(message)s',  # the queue handler only merges args; listener handlers apply the real format
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
     
     # Set specific log levels for external libraries
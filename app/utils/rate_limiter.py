@@ -3,82 +3,116 @@ Rate Limiting Utilities
 """
 
 import time
-import functools
-from collections import defaultdict, deque
-from flask import request, jsonify
+import threading
+from flask import current_app, g, request
 from app.core.config import Config
+from app.utils.responses import json_response
+
+# Token amounts are stored in integer units: one token is NS_PER_MINUTE
+# units, so a bucket refills `requests_per_minute` units per nanosecond.
+NS_PER_MINUTE = 60_000_000_000
 
 class RateLimiter:
-    """Simple in-memory rate limiter"""
+    """Simple in-memory token-bucket rate limiter"""
     
     def __init__(self):
-        self.requests = defaultdict(deque)
+        # (key, requests_per_minute) -> (tokens in units, last update in ns)
+        self.buckets = {}
+        self.next_sweep_ns = 0
+        # Serializes read-modify-write of a bucket across worker threads
+        self.lock = threading.Lock()
         self.config = Config()
     
+    def _refill(self, bucket_key, requests_per_minute: int, now_ns: int) -> int:
+        """Return the bucket's current token units after refilling"""
+        capacity = requests_per_minute * NS_PER_MINUTE
+        tokens, last_ns = self.buckets.get(bucket_key, (capacity, now_ns))
+        return min(capacity, tokens + (now_ns - last_ns) * requests_per_minute)
+    
+    def _sweep(self, now_ns: int):
+        """Drop buckets idle for over a minute, since they have refilled completely"""
+        cutoff = now_ns - NS_PER_MINUTE
+        for bucket_key, (_, last_ns) in list(self.buckets.items()):
+            if last_ns < cutoff:
+                self.buckets.pop(bucket_key, None)
+        self.next_sweep_ns = now_ns + NS_PER_MINUTE
+    
     def is_allowed(self, key: str, requests_per_minute: int) -> bool:
         """Check if request is allowed"""
         if not self.config.RATE_LIMIT_ENABLED:
             return True
         
-        now = time.time()
-        minute_ago = now - 60
-        
-        # Clean old requests
-        while self.requests[key] and self.requests[key][0] < minute_ago:
-            self.requests[key].popleft()
-        
-        # Check if limit exceeded
-        if len(self.requests[key]) >= requests_per_minute:
-            return False
-        
-        # Add current request
-        self.requests[key].append(now)
-        return True
+        bucket_key = (key, requests_per_minute)
+        with self.lock:
+            now_ns = time.monotonic_ns()
+            if now_ns >= self.next_sweep_ns:
+                self._sweep(now_ns)
+            
+            tokens = self._refill(bucket_key, requests_per_minute, now_ns)
+            
+            # Check if limit exceeded
+            if tokens < NS_PER_MINUTE:
+                self.buckets[bucket_key] = (tokens, now_ns)
+                return False
+            
+            # Consume one token
+            self.buckets[bucket_key] = (tokens - NS_PER_MINUTE, now_ns)
+            return True
     
     def get_remaining(self, key: str, requests_per_minute: int) -> int:
-        """Get remaining requests for the current minute"""
+        """Get remaining requests in the current bucket"""
         if not self.config.RATE_LIMIT_ENABLED:
             return requests_per_minute
         
-        now = time.time()
-        minute_ago = now - 60
-        
-        # Clean old requests
-        while self.requests[key] and self.requests[key][0] < minute_ago:
-            self.requests[key].popleft()
-        
-        return max(0, requests_per_minute - len(self.requests[key]))
+        tokens = self._refill((key, requests_per_minute), requests_per_minute, time.monotonic_ns())
+        return tokens // NS_PER_MINUTE
 
 # Global rate limiter instance
 rate_limiter = RateLimiter()
 
 def rate_limit(requests_per_minute: int = None):
-    """Rate limiting decorator"""
+    """Mark a view as rate limited; enforced by the hooks from init_rate_limiting"""
     def decorator(f):
-        @functools.wraps(f)
-        def wrapper(*args, **kwargs):
-            # Use provided limit or default from config
-            limit = requests_per_minute or Config().RATE_LIMIT_PER_MINUTE
-            
-            # Get client identifier (IP address)
-            client_id = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-            
-            # Check rate limit
-            if not rate_limiter.is_allowed(client_id, limit):
-                return jsonify({
-                    'error': 'Rate limit exceeded',
-                    'message': f'Maximum {limit} requests per minute allowed'
-                }), 429
-            
-            # Add rate limit headers
-            remaining = rate_limiter.get_remaining(client_id, limit)
-            response = f(*args, **kwargs)
-            
-            if hasattr(response, 'headers'):
-                response.headers['X-RateLimit-Limit'] = str(limit)
-                response.headers['X-RateLimit-Remaining'] = str(remaining)
-                response.headers['X-RateLimit-Reset'] = str(int(time.time() + 60))
-            
-            return response
-        return wrapper
-    return decorator
\ No newline at end of file
+        # Use provided limit or default from config
+        f._rate_limit = requests_per_minute or Config.RATE_LIMIT_PER_MINUTE
+        return f
+    return decorator
+
+def check_rate_limit():
+    """Reject the request if its view's rate limit is exceeded"""
+    # CORS preflight and automatic OPTIONS responses don't spend tokens
+    if request.method == 'OPTIONS':
+        return None
+    
+    view = current_app.view_functions.get(request.endpoint)
+    limit = getattr(view, '_rate_limit', None)
+    if limit is None:
+        return None
+    
+    # Get client identifier (IP address, already resolved by ProxyFix)
+    client_id = request.remote_addr
+    
+    # Check rate limit
+    allowed = rate_limiter.is_allowed(client_id, limit)
+    g.rate_limit = (limit, rate_limiter.get_remaining(client_id, limit))
+    if not allowed:
+        return json_response({
+            'error': 'Rate limit exceeded',
+            'message': f'Maximum {limit} requests per minute allowed'
+        }, 429)
+    return None
+
+def add_rate_limit_headers(response):
+    """Add rate limit headers to responses of rate-limited views"""
+    rate_limit_info = g.pop('rate_limit', None)
+    if rate_limit_info is not None and request.method != 'OPTIONS':
+        limit, remaining = rate_limit_info
+        response.headers['X-RateLimit-Limit'] = str(limit)
+        response.headers['X-RateLimit-Remaining'] = str(remaining)
+        response.headers['X-RateLimit-Reset'] = str(int(time.time() + 60))
+    return response
+
+def init_rate_limiting(app):
+    """Register the rate limiting request hooks on the app"""
+    app.before_request(check_rate_limit)
+    app.after_request(add_rate_limit_headers)
@@ -0,0 +1,73 @@
+"""
+Response Caching Utilities
+"""
+
+import time
+import functools
+import threading
+from typing import Hashable
+from flask import current_app, make_response, request
+from app.core.config import Config
+
+class ResponseCache:
+    """Simple in-memory TTL cache for serialized responses"""
+    
+    def __init__(self, max_entries: int = 1024):
+        self.entries = {}
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+    
+    def get(self, key: Hashable):
+        """Return cached (body, status, mimetype) if it has not expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            return payload
+    
+    def set(self, key: Hashable, payload, ttl: int):
+        """Store a payload for `ttl` seconds"""
+        with self.lock:
+            now = time.monotonic()
+            if len(self.entries) >= self.max_entries and key not in self.entries:
+                # Drop expired entries, then the oldest ones if still full
+                for stale_key in [k for k, (expires_at, _) in self.entries.items() if expires_at < now]:
+                    del self.entries[stale_key]
+                while len(self.entries) >= self.max_entries:
+                    del self.entries[next(iter(self.entries))]
+            self.entries[key] = (now + ttl, payload)
+    
+    def clear(self):
+        """Drop all cached responses"""
+        with self.lock:
+            self.entries.clear()
+
+# Global response cache instance
+response_cache = ResponseCache()
+
+def cached_response(ttl: int = None):
+    """Cache the serialized response of a view for `ttl` seconds"""
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            # Use provided TTL or default from config
+            timeout = ttl or Config.CACHE_TTL
+            # Endpoint plus path and query string, so distinct views and inputs never share a body
+            key = (request.endpoint, request.full_path)
+            
+            cached = response_cache.get(key)
+            if cached is not None:
+                body, status, mimetype = cached
+                return current_app.response_class(body, status=status, mimetype=mimetype)
+            
+            response = make_response(f(*args, **kwargs))
+            # Only cache successes, so transient errors aren't served for the whole TTL
+            if 200 <= response.status_code < 300:
+                response_cache.set(key, (response.get_data(), response.status_code, response.mimetype), timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,43 @@
+"""
+JSON Response Utilities
+"""
+
+import hashlib
+import orjson
+from flask import current_app, request
+
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+CACHE_MAX_AGE = 3600  # seconds
+
+def _json_default(obj):
+    """Serialize types orjson does not handle natively"""
+    # numpy scalars and other float/int subclasses
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps(obj) -> bytes:
+    """Serialize an object to JSON bytes"""
+    return orjson.dumps(obj, default=_json_default, option=JSON_OPTIONS)
+
+def json_response(obj, status: int = 200):
+    """Build a JSON response using orjson"""
+    return current_app.response_class(dumps(obj), status=status, mimetype='application/json')
+
+def compute_etag(body: bytes) -> str:
+    """Compute a strong ETag for a serialized body"""
+    return hashlib.md5(body).hexdigest()
+
+def cacheable_json_response(body: bytes, etag: str = None, max_age: int = CACHE_MAX_AGE):
+    """Build a cacheable JSON response, answering 304 when the client copy is current"""
+    etag = etag or compute_etag(body)
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
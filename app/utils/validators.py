@@ -5,6 +5,14 @@ Input Validation Utilities
 import re
 from typing import Dict, Any, Optional
 
+# Patterns compiled once at import
+HARMFUL_CHARS_RE = re.compile(r'[<>{}"\']')
+WHITESPACE_RE = re.compile(r'\s+')
+DOCUMENT_ID_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+# str.translate table deleting the same characters HARMFUL_CHARS_RE matches
+HARMFUL_CHARS_TABLE = str.maketrans('', '', '<>{}"\'')
+
 def validate_search_params(data: Dict[str, Any]) -> Optional[str]:
     """Validate search parameters"""
     
@@ -12,7 +20,10 @@ def validate_search_params(data: Dict[str, Any]) -> Optional[str]:
     if 'query' not in data:
         return "Query parameter is required"
     
-    query = data.get('query', '').strip()
+    query = data['query']
+    if not isinstance(query, str):
+        return "Query must be a string"
+    query = query.strip()
     
     # Check query length
     if not query:
@@ -25,7 +36,7 @@ def validate_search_params(data: Dict[str, Any]) -> Optional[str]:
         return "Query cannot exceed 1000 characters"
     
     # Check for potentially harmful content
-    if re.search(r'[<>{}"\']', query):
+    if HARMFUL_CHARS_RE.search(query):
         return "Query contains invalid characters"
     
     # Validate max_results
@@ -44,17 +55,17 @@ def validate_search_params(data: Dict[str, Any]) -> Optional[str]:
 def sanitize_query(query: str) -> str:
     """Sanitize search query"""
     # Remove potentially harmful characters
-    query = re.sub(r'[<>{}"\']', '', query)
+    query = query.translate(HARMFUL_CHARS_TABLE)
     
     # Normalize whitespace
-    query = re.sub(r'\s+', ' ', query.strip())
+    query = WHITESPACE_RE.sub(' ', query.strip())
     
     return query
 
 def validate_document_id(doc_id: str) -> bool:
     """Validate document ID format"""
     # Simple alphanumeric with underscores validation
-    return bool(re.match(r'^[a-zA-Z0-9_-]+$', doc_id))
+    return bool(DOCUMENT_ID_RE.match(doc_id))
 
 def validate_json_payload(data: Dict[str, Any], required_fields: list) -> Optional[str]:
     """Validate JSON payload has required fields"""
@@ -6,13 +6,17 @@ Production-ready semantic search with multiple search approaches
 
 import os
 import logging
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, render_template, request, send_from_directory
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from app.api.search_routes import search_bp
 from app.api.system_routes import system_bp
 from app.core.config import Config
+from app.core.health_monitor import HealthMonitor
 from app.core.search_service import SearchService
 from app.utils.logging_config import setup_logging
+from app.utils.rate_limiter import init_rate_limiting
+from app.utils.responses import json_response
 
 # Setup logging
 setup_logging()
@@ -25,6 +29,10 @@ def create_app():
     # Load configuration
     app.config.from_object(Config)
     
+    # Resolve the client address from X-Forwarded-For once, set by trusted proxies only
+    if Config.PROXY_FIX_X_FOR:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.PROXY_FIX_X_FOR)
+    
     # Enable CORS for API endpoints
     CORS(app, origins=app.config.get('CORS_ORIGINS', ['http://localhost:3000']))
     
@@ -36,6 +44,11 @@ def create_app():
     search_service = SearchService()
     app.search_service = search_service
     
+    # Refresh health status in the background
+    health_monitor = HealthMonitor(search_service)
+    health_monitor.start()
+    app.health_monitor = health_monitor
+    
     @app.route('/')
     def index():
         """Main application page"""
@@ -53,18 +66,21 @@ def create_app():
     @app.errorhandler(404)
     def not_found(error):
         """404 error handler"""
-        return jsonify({'error': 'Not found'}), 404
+        return json_response({'error': 'Not found'}, 404)
     
     @app.errorhandler(500)
     def internal_error(error):
         """500 error handler"""
         logger.error(f"Internal server error: {str(error)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}, 500)
     
     @app.before_request
     def before_request():
         """Log incoming requests"""
-        logger.info(f"{request.method} {request.path} - {request.remote_addr}")
+        logger.info("%s %s - %s", request.method, request.path, request.remote_addr)
+    
+    # Enforce per-view rate limits (registered after request logging so rejected requests are logged)
+    init_rate_limiting(app)
     
     return app
 